@@ -2,9 +2,26 @@
 
 import os
 import argparse
+import hashlib
+import mmap
 import re
-from multiprocessing import Pool
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+
+try:
+    import hyperscan
+except ImportError:
+    # Optional: a vectorised multi-pattern matcher, the fastest engine here
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional: without either matcher the scanner falls back to a regex
+    # hex-run search, which is slower but has no binary dependency
+    ahocorasick = None
 from colorama import init, Fore, Style
 from tabulate import tabulate
 from tqdm import tqdm
@@ -12,6 +29,19 @@ from humanize import naturalsize
 
 init()
 
+# Compiled once; .meta files are ASCII YAML with the guid near the top
+_GUID_RE = re.compile(rb"guid: ([a-f0-9]{32})")
+
+# Any maximal run of 32+ hex chars is a candidate GUID for the fallback scanner
+_HEX_RUN_RE = re.compile(rb"[0-9a-f]{32,}")
+
+# Reusable per-thread read buffers for meta file heads, so parsing 50k metas
+# doesn't allocate 50k short-lived bytes objects
+_META_LOCAL = threading.local()
+
+# How many meta files each pool task parses in one go
+_META_CHUNK_SIZE = 512
+
 # File extensions to check for references
 # Customise this list according to the kind of assets you have in your project!
 DEFAULT_EXTENSIONS_TO_CHECK = [
@@ -47,64 +77,276 @@ def find_assets_dir(start_path):
     raise FileNotFoundError("Could not find Assets directory in parent directories")
 
 
-def find_assets_to_check(dir_path):
+def walk_files(root_dir):
+    """Yield a DirEntry for every file below root_dir, without stat-ing each entry"""
+    stack = [root_dir]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Skip directories we can't list, like os.walk does
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+
+
+def parse_meta_chunk(meta_entries):
+    """Parse a batch of (meta_path, asset_path) pairs and return the (guid, asset_path) results"""
+    results = []
+    for meta_path, asset_path in meta_entries:
+        guid = get_guid_from_meta(meta_path)
+        if guid:
+            results.append((guid, asset_path))
+    return results
+
+
+def find_assets_to_check(dir_path, workers):
     """Collect all assets in the specified directory and return a dict of GUIDs to asset paths"""
+    # Walk directories one scandir at a time so each .meta can be checked
+    # against its sibling names - no exists()/isdir() stat calls needed.
+    # Folder .metas fall out naturally: the asset name is a directory, so it
+    # never lands in the file-name set
+    candidates = []
+    stack = [dir_path]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Skip directories we can't list, like os.walk does
+            continue
+        with entries:
+            file_names = set()
+            meta_entries = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    file_names.add(entry.name)
+                    if entry.name.endswith(".meta"):
+                        meta_entries.append(entry)
+            for entry in meta_entries:
+                asset_name = entry.name[:-5]  # Remove .meta extension
+                if asset_name in file_names:
+                    candidates.append((entry.path, entry.path[:-5]))
+
+    # Parse the meta files in parallel; batches keep the per-task overhead low
     assets_to_check = {}
-    for root, _, files in os.walk(dir_path):
-        for file in files:
-            if file.endswith(".meta"):
-                asset_path = os.path.join(root, file[:-5])  # Remove .meta extension
-                if os.path.exists(asset_path) and not os.path.isdir(asset_path):
-                    guid = get_guid_from_meta(os.path.join(root, file))
-                    if guid:
-                        assets_to_check[guid] = asset_path
+    chunks = [candidates[i : i + _META_CHUNK_SIZE] for i in range(0, len(candidates), _META_CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(parse_meta_chunk, chunks):
+            for guid, asset_path in results:
+                assets_to_check[guid] = asset_path
     return assets_to_check
 
 
 def get_guid_from_meta(meta_file_path):
     """Extract and return the GUID from a .meta file"""
     try:
-        with open(meta_file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            match = re.search(r"guid: ([a-f0-9]{32})", content)
-            if match:
-                return match.group(1)
+        buf = getattr(_META_LOCAL, "buf", None)
+        if buf is None:
+            buf = _META_LOCAL.buf = bytearray(512)
+            _META_LOCAL.view = memoryview(buf)
+        # The guid sits on the second line, so the first 512 bytes are plenty;
+        # read them unbuffered into this thread's buffer instead of allocating
+        with open(meta_file_path, "rb", buffering=0) as f:
+            n = f.readinto(buf)
+        match = _GUID_RE.search(_META_LOCAL.view[:n])
+        if match:
+            return match.group(1).decode("ascii")
     except Exception as e:
         print(f"Error reading meta file {meta_file_path}: {e}")
     return None
 
 
 def collect_searchable_files(assets_dir, extensions_to_check):
-    """Collect all files that need to be searched for GUID references"""
+    """Collect the files to search for GUID references, as (path, stat) pairs"""
     searchable_files = []
-    lowercase_extensions = [ext.lower() for ext in extensions_to_check]
-    for root, _, files in os.walk(assets_dir):
-        for file in files:
-            if any(file.lower().endswith(ext) for ext in lowercase_extensions):
-                file_path = os.path.join(root, file)
-                try:
-                    # Try to open the file to verify it's readable text
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        searchable_files.append(file_path)
-                except Exception:
-                    # Skip files that can't be read as text
-                    continue
+    lowercase_extensions = tuple(ext.lower() for ext in extensions_to_check)
+    for entry in walk_files(assets_dir):
+        # Unreadable files are skipped later by the scanner, so there's no
+        # need to probe-open anything here. The stat result is kept for the
+        # cache fingerprint and for size-ordered scheduling
+        if entry.name.lower().endswith(lowercase_extensions):
+            try:
+                searchable_files.append((entry.path, entry.stat(follow_symlinks=False)))
+            except OSError:
+                continue
     return searchable_files
 
 
-def find_references_to_guid(args):
-    """Search for GUID references in the pre-collected list of files"""
-    guid, searchable_files, asset_path = args
-    for file_path in searchable_files:
+def build_guid_hyperscan_db(guids):
+    """Compile the GUIDs into a Hyperscan block-mode database and an id->GUID table"""
+    expressions = [guid.encode("ascii") for guid in guids]
+    db = hyperscan.Database()
+    db.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return db
+
+
+def build_guid_automaton(guids):
+    """Build an Aho-Corasick automaton that matches any of the given GUIDs in one pass"""
+    automaton = ahocorasick.Automaton()
+    for guid in guids:
+        automaton.add_word(guid, guid)
+    automaton.make_automaton()
+    return automaton
+
+
+# Matcher state shared by the scan worker threads, set once by _init_scan_workers
+_SCAN_HS_DB = None
+_SCAN_HS_GUIDS = None
+_SCAN_AUTOMATON = None
+_SCAN_GUID_MAP = None
+
+# Hyperscan needs one scratch space per scanning thread
+_SCAN_LOCAL = threading.local()
+
+
+def _init_scan_workers(guids):
+    """Build and publish the shared GUID matcher for the scan worker threads"""
+    global _SCAN_HS_DB, _SCAN_HS_GUIDS, _SCAN_AUTOMATON, _SCAN_GUID_MAP
+    guid_list = list(guids)
+    # Both compiled engines reject an empty pattern set (pyahocorasick's
+    # make_automaton() silently leaves an empty trie unusable), so an empty
+    # GUID collection goes to the dict fallback, which handles it fine
+    if hyperscan is not None and guid_list:
+        _SCAN_HS_DB = build_guid_hyperscan_db(guid_list)
+        _SCAN_HS_GUIDS = guid_list
+    elif ahocorasick is not None and guid_list:
+        _SCAN_AUTOMATON = build_guid_automaton(guid_list)
+    else:
+        # Each GUID is encoded exactly once here; confirming a hit is then a
+        # single hashed 32-byte probe that also yields the canonical str form
+        _SCAN_GUID_MAP = {guid.encode("ascii"): guid for guid in guid_list}
+
+
+def _on_hyperscan_match(pattern_id, start, end, flags, matched_ids):
+    """Match callback: record the pattern id; SINGLEMATCH keeps this to one call per GUID"""
+    matched_ids.add(pattern_id)
+
+
+def _scan_fallback(mm):
+    """Find GUIDs in a mapped file without pyahocorasick.
+
+    One C-level regex pass pulls out every maximal hex run; each 32-char
+    candidate is then confirmed with a single dict probe, regardless of how
+    many GUIDs are being searched for.
+    """
+    found = set()
+    # Local bindings keep the loop to plain C calls, with no per-iteration
+    # global/attribute lookups
+    guid_map_get = _SCAN_GUID_MAP.get
+    found_add = found.add
+    for match in _HEX_RUN_RE.finditer(mm):
+        run = match.group()
+        if len(run) == 32:
+            guid = guid_map_get(run)
+            if guid is not None:
+                found_add(guid)
+        else:
+            # Longer hex runs (hashes, packed data) can still embed a GUID
+            for i in range(len(run) - 31):
+                guid = guid_map_get(run[i : i + 32])
+                if guid is not None:
+                    found_add(guid)
+    return found
+
+
+def open_scan_cache(assets_dir, guids):
+    """Open the per-project scan cache, dropping it if it can't be trusted.
+
+    Each row remembers which GUIDs a file referenced, fingerprinted by
+    (mtime, size). Rows only know about GUIDs that existed when they were
+    written, so if the current GUID set contains anything new the cached rows
+    could miss references to it and everything has to be rescanned. Shrinking
+    sets (the usual case while deleting assets) keep the cache valid.
+    """
+    cache_dir = Path.home() / ".cache" / "unity-clutter-cutter"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    project_key = hashlib.sha1(str(assets_dir).encode("utf-8")).hexdigest()[:16]
+    conn = sqlite3.connect(cache_dir / f"{project_key}.sqlite")
+    conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, guids TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS scans (id INTEGER PRIMARY KEY CHECK (id = 1), guid_set TEXT)")
+    row = conn.execute("SELECT guid_set FROM scans WHERE id = 1").fetchone()
+    known_guids = set(row[0].split()) if row else set()
+    if not set(guids) <= known_guids:
+        conn.execute("DELETE FROM files")
+    conn.execute("INSERT OR REPLACE INTO scans (id, guid_set) VALUES (1, ?)", (" ".join(guids),))
+    conn.commit()
+    return conn
+
+
+def start_readahead(file_paths):
+    """Ask the kernel to start reading the given files into the page cache.
+
+    posix_fadvise(WILLNEED) queues readahead asynchronously, so on a cold cache
+    the scan threads find most file data already resident instead of blocking
+    on every read. No-op on platforms without posix_fadvise (e.g. Windows).
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    def advise():
+        for file_path in file_paths:
+            try:
+                fd = os.open(file_path, os.O_RDONLY)
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            except OSError:
+                continue
+
+    threading.Thread(target=advise, daemon=True).start()
+
+
+def _scan_file(file_path):
+    """Scan one mapped file with whichever matcher engine is active"""
+    found = set()
+    with open(file_path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                if guid in content:
-                    return (asset_path, True)
-        except Exception:
-            # Skip if we suddenly can't read the file or it's not a text file
-            continue
-    return (asset_path, False)
+            # The scan is one front-to-back pass, so ask the kernel for
+            # aggressive readahead where madvise is available
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if _SCAN_HS_DB is not None:
+                scratch = getattr(_SCAN_LOCAL, "scratch", None)
+                if scratch is None:
+                    scratch = _SCAN_LOCAL.scratch = hyperscan.Scratch(_SCAN_HS_DB)
+                matched_ids = set()
+                _SCAN_HS_DB.scan(mm, match_event_handler=_on_hyperscan_match, context=matched_ids, scratch=scratch)
+                for pattern_id in matched_ids:
+                    found.add(_SCAN_HS_GUIDS[pattern_id])
+            elif _SCAN_AUTOMATON is not None:
+                # GUIDs are plain ASCII, so a 1:1 latin-1 view of the raw bytes
+                # is enough to match them - no UTF-8 validation pass, and binary
+                # files can be scanned instead of skipped
+                content = str(memoryview(mm), "latin-1")
+                for _, guid in _SCAN_AUTOMATON.iter(content):
+                    found.add(guid)
+            else:
+                found = _scan_fallback(mm)
+        finally:
+            mm.close()
+    return found
+
+
+def scan_file_for_guids(file_path):
+    """Scan a single file and return the set of asset GUIDs it references"""
+    try:
+        return _scan_file(file_path)
+    except (OSError, ValueError):
+        # The file vanished or shrank to nothing under us; it references nothing
+        return set()
 
 
 def main():
@@ -113,11 +355,11 @@ def main():
     parser = argparse.ArgumentParser(description="Find unused Unity assets in a directory")
     parser.add_argument("-d", "--dir", required=True, help="Path to the directory to check for unused assets")
     parser.add_argument(
-        "-p",
-        "--processes",
+        "-w",
+        "--workers",
         type=int,
         default=8,
-        help="Number of simultaneous processes to use for parallel searching (1-32, default 8)",
+        help="Number of simultaneous worker threads to use for parallel searching (1-32, default 8)",
     )
     parser.add_argument(
         "-e",
@@ -128,8 +370,8 @@ def main():
     )
     args = parser.parse_args()
 
-    if args.processes < 1 or args.processes > 32:
-        print("Error: Invalid number of processes. Please use a value between 1 and 32.")
+    if args.workers < 1 or args.workers > 32:
+        print("Error: Invalid number of workers. Please use a value between 1 and 32.")
         return
 
     # Verify the specified directory exists
@@ -146,7 +388,7 @@ def main():
 
     # Get all assets and their GUIDs from the specified directory
     print("Collecting list of assets to check in the specified directory...")
-    assets_to_check = find_assets_to_check(args.dir)
+    assets_to_check = find_assets_to_check(args.dir, args.workers)
     print(f"Found {Fore.GREEN}{len(assets_to_check)}{Style.RESET_ALL} assets to check")
 
     # Collect all searchable files
@@ -157,23 +399,77 @@ def main():
     print(f"Found {Fore.GREEN}{len(searchable_files)}{Style.RESET_ALL} files to search through")
 
     # Now we actually find unused assets!
-    unused_assets = []
     total_assets = len(assets_to_check)
 
     print(
         f"\nChecking {Fore.GREEN}{total_assets}{Style.RESET_ALL} assets for references through {Fore.GREEN}{len(searchable_files)}{Style.RESET_ALL} files..."
     )
 
-    # Prepare arguments for parallel processing
-    search_args = [(guid, searchable_files, asset_path) for guid, asset_path in assets_to_check.items()]
-
-    # Create a process pool and run searches in parallel
-    with Pool(processes=args.processes) as pool:
-        with tqdm(total=total_assets, unit="assets", colour="green") as pbar:
-            for result in pool.imap_unordered(find_references_to_guid, search_args):
-                pbar.update(1)
-                if not result[1]:
-                    unused_assets.append(result[0])
+    # Build a single matcher covering every GUID, so each file is scanned exactly
+    # once per run at most
+    _init_scan_workers(assets_to_check.keys())
+
+    # Reuse cached results for files whose fingerprint hasn't changed since the
+    # previous run; everything else gets scanned for real
+    cache = open_scan_cache(assets_dir, assets_to_check.keys())
+    cached_files = {
+        path: (mtime, size, guids) for path, mtime, size, guids in cache.execute("SELECT path, mtime, size, guids FROM files")
+    }
+    found_guids = set()
+    files_to_scan = []
+    cache_hits = 0
+    for file_path, stat in searchable_files:
+        if stat.st_size == 0:
+            # Nothing to find, and empty files can't be mmap'd anyway
+            continue
+        hit = cached_files.get(file_path)
+        if hit is not None and hit[0] == stat.st_mtime_ns and hit[1] == stat.st_size:
+            found_guids.update(guid for guid in hit[2].split() if guid in assets_to_check)
+            cache_hits += 1
+        else:
+            files_to_scan.append((file_path, stat.st_mtime_ns, stat.st_size))
+    if cache_hits:
+        print(f"Reusing cached results for {Fore.GREEN}{cache_hits}{Style.RESET_ALL} unchanged files")
+
+    # Hand out the largest files first so a straggler shadergraph picked up
+    # last can't leave one thread working alone at the end
+    files_to_scan.sort(key=lambda f: f[2], reverse=True)
+
+    # Scan the remaining files in parallel with a thread pool. The workload is
+    # file reads plus C-level matching, so threads avoid all of the fork/pickle
+    # overhead processes would pay
+    start_readahead([file_path for file_path, _, _ in files_to_scan])
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        with tqdm(total=len(files_to_scan), unit="files", colour="green", smoothing=0) as pbar:
+            futures = {
+                executor.submit(scan_file_for_guids, file_path): (file_path, mtime_ns, size)
+                for file_path, mtime_ns, size in files_to_scan
+            }
+            # Update the bar in batches; a per-file update is measurable
+            # overhead once individual scans get fast
+            pending_updates = 0
+            for future in as_completed(futures):
+                pending_updates += 1
+                if pending_updates >= 128:
+                    pbar.update(pending_updates)
+                    pending_updates = 0
+                found = future.result()
+                file_path, mtime_ns, size = futures[future]
+                cache.execute(
+                    "INSERT OR REPLACE INTO files (path, mtime, size, guids) VALUES (?, ?, ?, ?)",
+                    (file_path, mtime_ns, size, " ".join(sorted(found))),
+                )
+                found_guids |= found
+                if len(found_guids) == total_assets:
+                    # Every asset is referenced somewhere - the remaining files
+                    # can't change the outcome, so skip them
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+            pbar.update(pending_updates)
+    cache.commit()
+    cache.close()
+
+    unused_assets = [asset_path for guid, asset_path in assets_to_check.items() if guid not in found_guids]
 
     # Print results
     print(f"\n{Fore.GREEN}Analysis Complete!{Style.RESET_ALL}\n")